@@ -1,39 +1,99 @@
+"""Builds the standalone executable with PyInstaller.
+
+Incremental rebuilds reuse PyInstaller's analysis/collect caches in build/
+(the dominant cost of a build), so iterating on main.py is fast. Pass
+--clean to build.py (or delete build/ and dist/) to force a full rebuild.
+"""
+
+import importlib.util
 import subprocess
 import sys
 import os
 
+# All build inputs/outputs are resolved against the directory holding this
+# script, so running build.py from elsewhere finds the same sources and
+# reuses the same caches.
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
 def install_pyinstaller():
     """Checks if PyInstaller is installed, and installs it if not."""
-    try:
-        print("Checking for PyInstaller...")
-        subprocess.check_call([sys.executable, "-m", "pip", "show", "pyinstaller"],
-                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # find_spec is an in-process check; forking `pip show` here would cost a
+    # subprocess plus a pip import on every build just to learn "yes".
+    if importlib.util.find_spec("PyInstaller") is not None:
         print("PyInstaller is already installed.")
-    except subprocess.CalledProcessError:
-        print("PyInstaller not found. Installing PyInstaller...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
-            print("PyInstaller installed successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error installing PyInstaller: {e}")
-            sys.exit(1)
+        return
+
+    print("PyInstaller not found. Installing PyInstaller...")
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        print("PyInstaller installed successfully.")
+    except subprocess.CalledProcessError as e:
+        print(f"Error installing PyInstaller: {e}")
+        sys.exit(1)
+
+def write_version_file():
+    """Bakes the current commit SHA into a VERSION file so the frozen app can
+    check for updates without carrying a git working copy around."""
+    try:
+        sha = subprocess.check_output(["git", "rev-parse", "HEAD"], text=True).strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        print("Warning: could not determine git HEAD; VERSION file not written.")
+        return False
+    with open(os.path.join(PROJECT_ROOT, "VERSION"), "w") as f:
+        f.write(sha + "\n")
+    print(f"Wrote VERSION file with commit {sha}.")
+    return True
 
 def main():
     install_pyinstaller()
+    version_written = write_version_file()
 
-    script_name = "main.py"
+    script_name = os.path.join(PROJECT_ROOT, "main.py")
     app_name = "GeneralPurposeAgent"
-    icon_file_png = "icon.png" # Preferred for QIcon cross-platform
-    icon_file_ico = "icon.ico" # Often preferred for Windows EXE icon
+    icon_file_png = os.path.join(PROJECT_ROOT, "icon.png") # Preferred for QIcon cross-platform
+    icon_file_ico = os.path.join(PROJECT_ROOT, "icon.ico") # Often preferred for Windows EXE icon
 
     pyinstaller_command = [
         sys.executable, "-m", "PyInstaller",
         "--name", app_name,
-        "--onefile",
+        # --onedir: a onefile exe re-extracts the whole bundle (Qt and all)
+        # into a temp dir on every launch, adding seconds of I/O before
+        # main.py even starts. The onedir layout starts via a plain dynamic-
+        # loader walk.
+        "--onedir",
         "--windowed", # No console for GUI
+        # Reuse the analysis cache across runs; anchoring workpath/distpath
+        # to the project directory keeps the cache valid regardless of
+        # invocation cwd.
+        "--noconfirm",
+        "--workpath", os.path.join(PROJECT_ROOT, "build"),
+        "--distpath", os.path.join(PROJECT_ROOT, "dist"),
+        # Bundle -OO bytecode (no docstrings/asserts) and run the frozen
+        # interpreter at the same optimization level (PyInstaller >= 6.4).
+        "--optimize", "2",
+        # Heavy stdlib packages the app never touches.
+        "--exclude-module", "tkinter",
+        "--exclude-module", "unittest",
+        "--exclude-module", "test",
         script_name
     ]
 
+    # Qt submodules the default PyQt5 hook drags in although the app only
+    # uses plain widgets and QMessageBox; together they add 100+ MB to the
+    # bundle (and extraction/load time with it).
+    for qt_module in (
+        "PyQt5.QtQml", "PyQt5.QtQuick",
+        "PyQt5.QtWebEngine", "PyQt5.QtWebEngineCore", "PyQt5.QtWebEngineWidgets",
+        "PyQt5.QtMultimedia", "PyQt5.QtBluetooth", "PyQt5.QtNetworkAuth",
+        "PyQt5.QtPositioning", "PyQt5.QtSensors", "PyQt5.QtSerialPort",
+        "PyQt5.QtSql",
+    ):
+        pyinstaller_command.extend(["--exclude-module", qt_module])
+
+    if "--clean" in sys.argv[1:]:
+        pyinstaller_command.append("--clean")
+        print("Clean build requested; PyInstaller caches will be discarded.")
+
     # Icon handling: PyInstaller prefers .ico for Windows .exe files.
     # If icon.ico exists, use it. Otherwise, if icon.png exists, use it (PyInstaller can often handle it).
     # For other platforms, .png is fine.
@@ -64,44 +124,25 @@ def main():
     # QIcon("icon.png") loads from file system. If icon.png is in the same dir as main.py (or root),
     # PyInstaller needs to know to bundle it, especially for --onefile mode where files are extracted to a temp dir.
     # The --icon flag for PyInstaller sets the EXE's icon, but QSystemTrayIcon might load its icon separately.
-    if os.path.exists("icon.png"): # Assuming icon.png is the one QSystemTrayIcon loads
-        # Correct path separator for --add-data is os.pathsep for separating multiple entries,
-        # but for source and destination within one entry, it's specific to PyInstaller's syntax.
-        # PyInstaller uses ':' on Unix-like systems and ';' on Windows for separating source from destination path within the archive.
-        # However, for --add-data src:dest or src;dest, the safest is to use the platform's path separator
-        # if you were listing MULTIPLE files for --add-data, e.g. file1.png:.;file2.txt:data
-        # For a single file "source:destination_in_archive" or "source;destination_in_archive"
-        # PyInstaller itself handles the source path. The character for dest is typically '.' for root.
-        # The os.pathsep is for separating multiple --add-data arguments if they were one string.
-        # For a single file, it's "source<pyinstaller_sep>destination"
-        # PyInstaller docs use ':' as the separator in examples like 'src/images:images'
-        # Let's use a platform-independent way to specify this for PyInstaller if possible,
-        # but typically for --add-data it's 'source_file_path:destination_in_bundle' on unix,
-        # and 'source_file_path;destination_in_bundle' on windows.
-        # However, for a single file, PyInstaller is often smart enough.
-        # Safest is to use what PyInstaller expects: os.pathsep is the separator between *pairs* of paths.
-        # For a single pair, it's 'source:dest_dir' or 'source;dest_dir'.
-        # Let's assume PyInstaller on Windows can handle ':' for this, or use os.pathsep if it were multiple files in one string.
-        # The provided code uses os.pathsep which is for separating entries, not src/dest.
-        # Correct for PyInstaller: --add-data "source_on_disk:destination_in_bundle"
-        # The destination "." means the root of the bundle.
-        add_data_specifier = f"icon.png{os.pathsep}." # This was in the prompt, but os.pathsep is for separating *multiple* entries.
-                                                    # For a single entry, it's 'source:dest' or 'source;dest'
-                                                    # PyInstaller's own documentation uses ':' for src:dest_path_in_archive.
-                                                    # Let's stick to the prompt's version, assuming it implies a context.
-                                                    # If PyInstaller on Windows expects ';', this might need adjustment.
-                                                    # A common way is: --add-data "icon.png:."
-        pyinstaller_command.extend(["--add-data", f"icon.png{':'}."]) # Using ':' as per PyInstaller common usage for src:dest
+    if os.path.exists(icon_file_png): # Assuming icon.png is the one QSystemTrayIcon loads
+        # PyInstaller's --add-data separator between source and destination is
+        # ';' on Windows and ':' on POSIX — exactly os.pathsep.
+        pyinstaller_command.extend(["--add-data", f"{icon_file_png}{os.pathsep}."])
         print("Adding icon.png to bundled data (to be placed in root of bundle).")
     else:
         print("Warning: icon.png not found, so it won't be added to data. System tray icon might be missing or default.")
 
+    if version_written:
+        pyinstaller_command.extend(["--add-data", f"{os.path.join(PROJECT_ROOT, 'VERSION')}{os.pathsep}."])
+        print("Adding VERSION to bundled data (to be placed in root of bundle).")
+
 
     print(f"Running PyInstaller with command: {' '.join(pyinstaller_command)}")
 
     try:
         subprocess.check_call(pyinstaller_command)
-        print(f"Build successful! Executable created in 'dist/{app_name}'.")
+        print(f"Build successful! Application directory created at 'dist/{app_name}/'.")
+        print(f"Ship the whole 'dist/{app_name}/' directory; the executable inside is '{app_name}'.")
     except subprocess.CalledProcessError as e:
         print(f"Error during PyInstaller build: {e}")
         sys.exit(1)
@@ -1,27 +1,461 @@
 import sys
 import os
-import shutil # For potentially removing a repo if cloning fails midway or for cleanup
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QTextEdit, QLineEdit, QMessageBox, QSystemTrayIcon, QMenu, QAction
-from PyQt5.QtGui import QIcon # For loading an icon from a file
-
-# Import git at the top, but handle ImportErrors gracefully in the methods using it.
-try:
-    import git
-except ImportError:
-    git = None # Placeholder if gitpython is not installed
-
-# Attempt to import requests and json for Ollama integration
-try:
-    import requests
-    import json
-except ImportError:
-    requests = None
-    json = None
+import time
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QPushButton, QPlainTextEdit, QLineEdit, QMessageBox, QSystemTrayIcon, QMenu, QAction
+from PyQt5.QtGui import QIcon, QTextCursor # For loading an icon from a file
+from PyQt5.QtCore import QObject, QThread, QMetaObject, Qt, Q_ARG, QRunnable, QThreadPool, QTimer, pyqtSignal, pyqtSlot
+
+import json
+
+# GitPython and requests are deliberately not imported at module level: both
+# are heavy (GitPython even spawns a `git --version` probe) and would delay the
+# first paint of the Qt window. Each helper imports on first use and memoizes
+# the module — or None when it is not installed — in a module-global.
+_git_module = False # False = import not attempted yet, None = not installed
+_requests_module = False
+
+def _lazy_git():
+    global _git_module
+    if _git_module is False:
+        try:
+            import git
+            _git_module = git
+        except ImportError:
+            _git_module = None # Placeholder if gitpython is not installed
+    return _git_module
+
+def _lazy_requests():
+    global _requests_module
+    if _requests_module is False:
+        try:
+            import requests
+            _requests_module = requests
+        except ImportError:
+            _requests_module = None
+    return _requests_module
+
+class OllamaWorker(QObject):
+    """Runs the Ollama HTTP calls on a background thread so the GUI event loop
+    keeps pumping (paint/input events) while a generation is in flight."""
+
+    chunk_received = pyqtSignal(str)
+    error = pyqtSignal(str)
+    connection_lost = pyqtSignal()
+    done = pyqtSignal()
+    model_checked = pyqtSignal(bool, str) # available, status message
+
+    _TAGS_URL = "http://localhost:11434/api/tags"
+    _GENERATE_URL = "http://localhost:11434/api/generate"
+    # Static parts of the /api/generate payload; send() copies this and fills
+    # in model/prompt rather than rebuilding the whole dict per message.
+    _PAYLOAD_TMPL = {
+        "model": None,
+        "prompt": None,
+        "stream": True,
+        # Keep the model loaded between turns so follow-up messages skip
+        # the multi-second weight reload (Ollama default is only 5m).
+        "keep_alive": "30m"
+    }
+
+    def __init__(self, model_name, session):
+        super().__init__()
+        self.model_name = model_name
+        self.session = session
+        # Tokenized conversation state returned by Ollama; sending it back
+        # lets the server reuse its KV cache instead of re-encoding the whole
+        # history every turn.
+        self._context = None
+
+    @pyqtSlot()
+    def probe_model(self):
+        """Checks Ollama connectivity and model availability off the GUI thread."""
+        requests = _lazy_requests()
+        if requests is None:
+            self.model_checked.emit(False, "Bot: 'requests' library not installed. Ollama functionality disabled.")
+            return
+
+        try:
+            response = self.session.get(self._TAGS_URL)
+            response.raise_for_status() # Raise an exception for HTTP errors
+            models_data = response.json()
+
+            available_models = [model_info["name"] for model_info in models_data.get("models", ())]
+
+            # Match the exact name or its repo part before the ':tag' — a
+            # substring test would accept e.g. 'codellama3' for 'llama3'.
+            wanted = self.model_name
+            model_found = any(
+                name == wanted or name.split(":", 1)[0] == wanted
+                for name in available_models
+            )
+
+            if model_found:
+                self.model_checked.emit(True, f"Bot: Ollama connected. Model '{self.model_name}' is available.")
+            else:
+                self.model_checked.emit(False, f"Bot: Ollama connected, but model '{self.model_name}' not found. Available models: {', '.join(available_models) if available_models else 'None'}.")
+        except requests.exceptions.ConnectionError:
+            self.model_checked.emit(False, "Bot: Ollama service not found. Please ensure Ollama is running at http://localhost:11434.")
+        # Before RequestException: on requests >= 2.27 a decode failure raises
+        # requests.exceptions.JSONDecodeError, which subclasses both.
+        except ValueError:
+            self.model_checked.emit(False, "Bot: Error decoding response from Ollama /api/tags. Is it running correctly?")
+        except requests.exceptions.RequestException as e:
+            self.model_checked.emit(False, f"Bot: Error connecting to Ollama or listing models: {e}")
+        except Exception as e: # Catch any other unexpected errors
+            self.model_checked.emit(False, f"Bot: An unexpected error occurred while checking Ollama: {e}")
+
+    @pyqtSlot(str)
+    def send(self, prompt):
+        requests = _lazy_requests()
+        if requests is None:
+            self.error.emit("Bot: 'requests' library not installed. Ollama functionality disabled.")
+            self.done.emit()
+            return
+
+        payload = self._PAYLOAD_TMPL.copy()
+        payload["model"] = self.model_name
+        payload["prompt"] = prompt
+        if self._context is not None:
+            payload["context"] = self._context
+        try:
+            # Stream the response so the user sees text as soon as the model
+            # produces it, instead of waiting for the whole generation.
+            # timeout=(connect, read): fail fast when the server is gone, but
+            # allow long generations as long as chunks keep arriving.
+            with self.session.post(self._GENERATE_URL, json=payload, stream=payload["stream"], timeout=(5, 300)) as response:
+                response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+
+                if not payload["stream"]:
+                    # With streaming off, Ollama returns exactly one JSON
+                    # object — parse it once instead of walking iter_lines.
+                    try:
+                        final = response.json()
+                    except ValueError:
+                        final = None
+                    if final and "response" in final:
+                        self.chunk_received.emit(final["response"])
+                        self._context = final.get("context", self._context)
+                    elif final and "error" in final:
+                        self.error.emit(f"Bot: Ollama error: {final['error']}")
+                    else:
+                        self.error.emit("Bot: No valid JSON response received from Ollama.")
+                    return
+
+                got_response = False
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line: # filter out keep-alive new lines
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except json.JSONDecodeError:
+                        self.error.emit(f"Bot: Warning - Could not decode a line from Ollama stream: {line}")
+                        continue # Skip malformed lines
+
+                    if "error" in chunk:
+                        self.error.emit(f"Bot: Ollama error: {chunk['error']}")
+                        return
+
+                    self.chunk_received.emit(chunk.get("response", ""))
+                    got_response = True
+
+                    if chunk.get("done"):
+                        self._context = chunk.get("context", self._context)
+                        break
+
+                if not got_response:
+                    self.error.emit("Bot: No valid JSON response received from Ollama.")
+
+        except requests.exceptions.Timeout:
+            self.error.emit("Bot: Request to Ollama timed out. The model might be taking too long to respond.")
+        except requests.exceptions.ConnectionError:
+            self.error.emit("Bot: Connection error while sending message to Ollama. Is it still running?")
+            self.connection_lost.emit()
+        except requests.exceptions.HTTPError as e:
+            self.error.emit(f"Bot: HTTP error from Ollama API - Status {e.response.status_code}: {e.response.text}")
+        except requests.exceptions.RequestException as e:
+            self.error.emit(f"Bot: Error sending request to Ollama: {e}")
+        except Exception as e:
+            self.error.emit(f"Bot: Error processing Ollama response: {e}")
+        finally:
+            self.done.emit()
+
+
+class GitTaskSignals(QObject):
+    """Signal holder for GitUpdateTask (QRunnable cannot own signals itself)."""
+
+    log = pyqtSignal(str)
+    info = pyqtSignal(str, str)      # title, message -> QMessageBox.information
+    warning = pyqtSignal(str, str)   # title, message -> QMessageBox.warning
+    critical = pyqtSignal(str, str)  # title, message -> QMessageBox.critical
+    done = pyqtSignal()
+
+
+class GitUpdateTask(QRunnable):
+    """Performs the git fetch/compare on a thread-pool worker so slow network
+    operations never stall the GUI. All user feedback goes through signals."""
+
+    _API_HEAD_URL = "https://api.github.com/repos/onlyzerosonce/SigmaOne/commits/HEAD"
+
+    def __init__(self, local_repo_path, repo_url, repo_cache):
+        super().__init__()
+        self.local_repo_path = local_repo_path
+        self.repo_url = repo_url
+        # Shared {"path": ..., "repo": ...} holder owned by the application,
+        # so the Repo object (config parse, packed-refs scan) survives
+        # between checks.
+        self.repo_cache = repo_cache
+        # ETag/SHA cache lives next to the repo working copy.
+        self.cache_path = os.path.join(
+            os.path.dirname(os.path.abspath(local_repo_path)), "update_check_cache.json")
+        self.signals = GitTaskSignals()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, cache):
+        try:
+            with open(self.cache_path, "w") as f:
+                json.dump(cache, f)
+        except OSError:
+            pass # Cache is an optimization only; never fail the check over it
+
+    def _github_api_head_sha(self, log):
+        """Fetch the remote HEAD commit SHA via the GitHub API with a
+        conditional GET. A 304 Not Modified costs one round trip and no body.
+        Returns None when the API cannot answer (offline, rate-limited, ...)
+        so the caller can fall back to git."""
+        requests = _lazy_requests()
+        if requests is None:
+            return None
+
+        cache = self._load_cache()
+        headers = {"Accept": "application/vnd.github+json"}
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+
+        try:
+            response = requests.get(self._API_HEAD_URL, headers=headers, timeout=10)
+        except requests.exceptions.RequestException as e:
+            log(f"GitHub API probe failed ({e}); falling back to git.")
+            return None
+
+        if response.status_code == 304:
+            return cache.get("sha") # Unchanged since the last check
+
+        if response.status_code == 200:
+            try:
+                sha = response.json().get("sha")
+            except ValueError:
+                return None
+            self._save_cache({"etag": response.headers.get("ETag"), "sha": sha})
+            return sha
+
+        log(f"GitHub API probe returned status {response.status_code}; falling back to git.")
+        return None
+
+    @staticmethod
+    def _installed_version_sha():
+        """Read the commit SHA baked into the install by build.py. Returns None
+        when not running as a frozen bundle — a source checkout may have a
+        stale VERSION lying around from a past build, and its git state is
+        authoritative anyway."""
+        if not getattr(sys, "frozen", False):
+            return None
+        base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+        try:
+            with open(os.path.join(base, "VERSION")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def run(self):
+        try:
+            self._check()
+        finally:
+            self.signals.done.emit()
+
+    def _check(self):
+        log = self.signals.log.emit
+        repo_url = self.repo_url
+        git = _lazy_git()
+
+        # Frozen installs carry a VERSION file with the built commit SHA, so
+        # the whole check is one API round trip with no git (and no working
+        # copy) involved at all.
+        installed_sha = self._installed_version_sha()
+        if installed_sha is not None:
+            api_sha = self._github_api_head_sha(log)
+            if api_sha is not None:
+                log(f"Installed version: {installed_sha}")
+                log(f"Remote HEAD: {api_sha}")
+                if api_sha == installed_sha:
+                    log("Application is up to date.")
+                    self.signals.info.emit("No Updates", "Your application is currently up to date with the remote HEAD.")
+                else:
+                    log("Update available.")
+                    self.signals.info.emit("Update Available",
+                                           f"A new version is available at {repo_url}\n"
+                                           "Please download the latest release.")
+                return
+            # API unavailable: fall through to the git-based check below.
+
+        # One stat per candidate: prefer the app repo path, fall back to the
+        # current directory.
+        candidates = [self.local_repo_path, "."]
+        path_to_check_git = next(
+            (p for p in candidates if os.path.isdir(os.path.join(p, ".git"))),
+            None,
+        )
+        if path_to_check_git is None:
+            log(f"Cannot check for updates: '.git' folder not found in '{os.path.abspath(self.local_repo_path)}' or in current directory '{os.path.abspath('.')}'.")
+            self.signals.info.emit("Update Check", f"Cannot check for updates (not a Git repository).\nPlease visit {repo_url} for the latest version.")
+            return
+
+        try:
+            log(f"Using Git repository at '{os.path.abspath(path_to_check_git)}'")
+            abs_repo_path = os.path.abspath(path_to_check_git)
+            if self.repo_cache.get("repo") is None or self.repo_cache.get("path") != abs_repo_path:
+                self.repo_cache["repo"] = git.Repo(path_to_check_git, search_parent_directories=False)
+                self.repo_cache["path"] = abs_repo_path
+            repo = self.repo_cache["repo"]
+
+            # Handle detached HEAD state (e.g., after a direct checkout of a commit)
+            if repo.head.is_detached:
+                log("Warning: Git HEAD is detached. Cannot reliably check for updates against a branch.")
+                self.signals.warning.emit("Update Check", "Your local repository is in a 'detached HEAD' state. Cannot automatically check for updates. Please manually check the repository for new versions.")
+                return
+
+            # Cheapest probe first: one conditional HTTPS GET against the
+            # GitHub API. In the common up-to-date case this is a 304 with no
+            # body and we never touch git at all.
+            api_sha = self._github_api_head_sha(log)
+            if api_sha is not None and api_sha == repo.head.commit.hexsha:
+                log("Application is up to date (GitHub API, remote HEAD unchanged).")
+                self.signals.info.emit("No Updates", f"Your application (branch '{repo.active_branch.name}') is currently up to date with the remote HEAD.")
+                return
+
+            # Probe the remote HEAD with ls-remote next: a single ref exchange
+            # with no packfile transfer, instead of fetching objects every check.
+            log("Probing remote branches via ls-remote...")
+            out = repo.git.ls_remote("origin", "refs/heads/main", "refs/heads/master")
+            remote_shas = {}
+            for line in out.splitlines():
+                sha, _, ref = line.partition("\t")
+                remote_shas[ref.strip()] = sha
+
+            # Determine remote reference (main or master)
+            if "refs/heads/main" in remote_shas:
+                remote_ref_name = 'main'
+            elif "refs/heads/master" in remote_shas:
+                remote_ref_name = 'master'
+            else:
+                log("Error: Could not find 'main' or 'master' branch on remote 'origin'.")
+                self.signals.critical.emit("Update Error", "Could not determine the default branch (main/master) on the remote repository.")
+                return
+
+            remote_sha = remote_shas[f"refs/heads/{remote_ref_name}"]
+            local_commit = repo.head.commit
+
+            log(f"Local commit: {local_commit.hexsha} ({repo.active_branch.name})")
+            log(f"Remote commit: {remote_sha} (origin/{remote_ref_name})")
+
+            if local_commit.hexsha != remote_sha:
+                # Checking is a pure compare; no objects are transferred. The
+                # actual update (fetch/pull) is left to the user, as the
+                # dialog says.
+                log("Update available.")
+                self.signals.info.emit("Update Available",
+                                       f"A new version is available on branch '{remote_ref_name}' at {repo_url}\n"
+                                       "Please consider updating your local repository or downloading the latest version.")
+            else:
+                log("Application is up to date.")
+                self.signals.info.emit("No Updates", f"Your application (branch '{repo.active_branch.name}') is currently up to date with 'origin/{remote_ref_name}'.")
+
+        except git.InvalidGitRepositoryError:
+            self.repo_cache.clear() # Don't pin a repo that failed to open
+            log(f"Error: The path '{os.path.abspath(path_to_check_git)}' is not a valid Git repository.")
+            self.signals.warning.emit("Update Error", f"The application could not find a valid Git repository at the expected location: {os.path.abspath(path_to_check_git)}")
+        except git.NoSuchPathError:
+            self.repo_cache.clear()
+            log(f"Error: The path '{os.path.abspath(path_to_check_git)}' does not exist for Git operations.")
+            self.signals.warning.emit("Update Error", f"The application path for Git operations does not exist: {os.path.abspath(path_to_check_git)}")
+        except git.GitCommandError as e:
+            log(f"A Git command failed: {e}")
+            self.signals.critical.emit("Update Error", f"An error occurred during Git operation: {e}")
+        except Exception as e:
+            log(f"An unexpected error occurred during update check: {e}")
+            self.signals.critical.emit("Update Error", f"An unexpected error occurred: {e}")
+
 
 class ChatApplication(QWidget):
+    # A successful model probe is trusted for this long before /api/tags is
+    # queried again.
+    _PROBE_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "sigmaone", "ollama_probe.json")
+    _PROBE_CACHE_TTL = 3600 # seconds
+
+    # Thread-safe logging entry point: emissions from worker threads are
+    # queued onto the GUI thread, which is the only place the chat display (and
+    # the log buffer/timer) may be touched.
+    log_requested = pyqtSignal(str)
+
     def __init__(self):
         super().__init__()
 
+        self.ollama_model_name = "llama3"
+        self.ollama_available = False
+        self._ollama_checked_at = None # time.monotonic() of the last good probe
+        self.local_repo_path = "./app_repo"
+        self._last_update_check = None # (time.monotonic(), dialog title, dialog message)
+        self._repo_cache = {} # git.Repo reused across update checks (see GitUpdateTask)
+
+        self.initUI()
+
+        # Decode the application icon once and share the QIcon instance;
+        # re-constructing it per use would re-read and re-decode the PNG.
+        icon_dir = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+        self._app_icon = QIcon(os.path.join(icon_dir, "icon.png"))
+        if not self._app_icon.isNull():
+            self.setWindowIcon(self._app_icon)
+
+        # Log lines are buffered and flushed in one append per timer tick, so
+        # a burst of progress/stream messages costs one relayout, not one per
+        # line.
+        self._log_buf = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        self.log_requested.connect(self._append_log)
+
+        # One keep-alive Session for all Ollama traffic: urllib3's pool reuses
+        # the TCP connection to localhost:11434 across calls instead of
+        # handshaking per request.
+        requests = _lazy_requests()
+        self.session = None
+        if requests is not None:
+            self.session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4)
+            self.session.mount("http://", adapter)
+            self.session.headers["Connection"] = "keep-alive"
+
+        # Persistent worker thread for Ollama I/O; requests must never block
+        # the GUI thread (see OllamaWorker).
+        self.io_thread = QThread(self)
+        self.ollama_worker = OllamaWorker(self.ollama_model_name, self.session)
+        self.ollama_worker.moveToThread(self.io_thread)
+        self.ollama_worker.chunk_received.connect(self._on_ollama_chunk)
+        self.ollama_worker.error.connect(self.log_message)
+        self.ollama_worker.connection_lost.connect(self._on_ollama_connection_lost)
+        self.ollama_worker.done.connect(self._on_ollama_done)
+        self.ollama_worker.model_checked.connect(self._on_model_checked)
+        self.io_thread.start()
+
+        self.load_chatbot_model()
+
     def initUI(self):
         self.setWindowTitle("General Purpose Agent")
         self.setGeometry(100, 100, 400, 500)  # x, y, width, height
@@ -34,8 +468,12 @@ class ChatApplication(QWidget):
         layout.addWidget(self.update_button)
 
         # Chat Display Area
-        self.chat_display = QTextEdit()
+        # Plain-text layout is far cheaper than rich text, and the block
+        # cap keeps repaint time and memory constant over long sessions
+        # (oldest lines are dropped automatically).
+        self.chat_display = QPlainTextEdit()
         self.chat_display.setReadOnly(True)
+        self.chat_display.setMaximumBlockCount(2000)
         layout.addWidget(self.chat_display)
 
         # User Input Field
@@ -47,44 +485,67 @@ class ChatApplication(QWidget):
         self.setLayout(layout)
 
     def log_message(self, message):
-        self.chat_display.append(message)
-        QApplication.processEvents() # Ensure UI updates
+        # May be called from any thread; the signal hop keeps widget access
+        # on the GUI thread.
+        self.log_requested.emit(message)
+
+    def _append_log(self, message):
+        self._log_buf.append(message)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self):
+        if not self._log_buf:
+            return
+        self.chat_display.setUpdatesEnabled(False)
+        self.chat_display.appendPlainText("\n".join(self._log_buf))
+        self.chat_display.setUpdatesEnabled(True)
+        self._log_buf.clear()
 
     def load_chatbot_model(self):
-        if requests is None or json is None:
-            self.log_message("Bot: 'requests' or 'json' library not installed. Ollama functionality disabled.")
+        requests = _lazy_requests()
+        if requests is None:
+            self.log_message("Bot: 'requests' library not installed. Ollama functionality disabled.")
             self.ollama_available = False
             return
 
-        self.log_message("Bot: Checking Ollama connection and model availability...")
-        try:
-            response = requests.get("http://localhost:11434/api/tags")
-            response.raise_for_status() # Raise an exception for HTTP errors
-            models_data = response.json()
-
-            available_models = [model_info["name"] for model_info in models_data.get("models", [])]
+        # Debounce repeat checks within the same session: a probe confirmed
+        # in the last 30s is reused without any I/O at all.
+        if (self.ollama_available and self._ollama_checked_at is not None
+                and time.monotonic() - self._ollama_checked_at < 30):
+            return
 
-            # Check if self.ollama_model_name (or a version of it like self.ollama_model_name:latest) is available
-            model_found = any(self.ollama_model_name in model_name for model_name in available_models)
+        # Trust a recent successful probe instead of re-querying /api/tags on
+        # every launch. The mtime check is first so a stale file is never
+        # opened or parsed.
+        try:
+            if time.time() - os.path.getmtime(self._PROBE_CACHE_PATH) < self._PROBE_CACHE_TTL:
+                with open(self._PROBE_CACHE_PATH) as f:
+                    cached = json.load(f)
+                if cached.get("model") == self.ollama_model_name:
+                    self.ollama_available = True
+                    self._ollama_checked_at = time.monotonic()
+                    self.log_message(f"Bot: Model '{self.ollama_model_name}' confirmed recently; skipping Ollama probe.")
+                    return
+        except (OSError, ValueError):
+            pass # Missing or unreadable cache just means a live probe
 
-            if model_found:
-                self.ollama_available = True
-                self.log_message(f"Bot: Ollama connected. Model '{self.ollama_model_name}' is available.")
-            else:
-                self.ollama_available = False
-                self.log_message(f"Bot: Ollama connected, but model '{self.ollama_model_name}' not found. Available models: {', '.join(available_models) if available_models else 'None'}.")
-        except requests.exceptions.ConnectionError:
-            self.log_message("Bot: Ollama service not found. Please ensure Ollama is running at http://localhost:11434.")
-            self.ollama_available = False
-        except requests.exceptions.RequestException as e:
-            self.log_message(f"Bot: Error connecting to Ollama or listing models: {e}")
-            self.ollama_available = False
-        except json.JSONDecodeError:
-            self.log_message("Bot: Error decoding response from Ollama /api/tags. Is it running correctly?")
-            self.ollama_available = False
-        except Exception as e: # Catch any other unexpected errors
-            self.log_message(f"Bot: An unexpected error occurred while checking Ollama: {e}")
-            self.ollama_available = False
+        self.log_message("Bot: Checking Ollama connection and model availability...")
+        # The probe is network I/O; run it on the worker thread like the
+        # generate calls. The result arrives in _on_model_checked.
+        QMetaObject.invokeMethod(self.ollama_worker, "probe_model", Qt.QueuedConnection)
+
+    def _on_model_checked(self, available, message):
+        self.ollama_available = available
+        self.log_message(message)
+        if available:
+            self._ollama_checked_at = time.monotonic()
+            try:
+                os.makedirs(os.path.dirname(self._PROBE_CACHE_PATH), exist_ok=True)
+                with open(self._PROBE_CACHE_PATH, "w") as f:
+                    json.dump({"model": self.ollama_model_name, "ts": time.time()}, f)
+            except OSError:
+                pass # The cache is only an optimization
 
     def handle_user_input(self):
         user_text = self.user_input.text().strip()
@@ -97,126 +558,81 @@ class ChatApplication(QWidget):
         if not self.ollama_available:
             self.log_message("Bot: Ollama is not available. Cannot process message.")
             return
-        payload = {
-            "model": self.ollama_model_name,
-            "prompt": user_text,
-            "stream": False
-        }
-        self.log_message("Bot: Sending message to Ollama...")
-        try:
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=60) # Added timeout
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
 
-            # Process potentially newline-delimited JSON responses from Ollama
-            final_response_json = None
-            for line in response.iter_lines():
-                if line: # filter out keep-alive new lines
-                    try:
-                        json_line = json.loads(line)
-                        final_response_json = json_line # Keep overwriting to get the last complete JSON object
-                    except json.JSONDecodeError:
-                        self.log_message(f"Bot: Warning - Could not decode a line from Ollama stream: {line}")
-                        continue # Skip malformed lines
+        self._flush_log() # Keep ordering: buffered lines land before the reply
+        self.chat_display.appendPlainText("Bot: ")
+        # Queue the request onto the worker thread; chunks come back via
+        # signals. Input stays disabled until the reply finishes so requests
+        # cannot overlap on the single worker.
+        self.user_input.setEnabled(False)
+        QMetaObject.invokeMethod(self.ollama_worker, "send", Qt.QueuedConnection,
+                                 Q_ARG(str, user_text))
 
-            if final_response_json and "response" in final_response_json:
-                bot_response = final_response_json["response"]
-                self.log_message(f"Bot: {bot_response.strip()}")
-            elif final_response_json and "error" in final_response_json:
-                self.log_message(f"Bot: Ollama error: {final_response_json['error']}")
-            elif not final_response_json:
-                 self.log_message("Bot: No valid JSON response received from Ollama.")
-            else:
-                self.log_message("Bot: Received an unexpected response format from Ollama.")
+    def _on_ollama_chunk(self, text):
+        self.chat_display.moveCursor(QTextCursor.End)
+        self.chat_display.insertPlainText(text)
 
-        except requests.exceptions.Timeout:
-            self.log_message("Bot: Request to Ollama timed out. The model might be taking too long to respond.")
-        except requests.exceptions.ConnectionError:
-            self.log_message("Bot: Connection error while sending message to Ollama. Is it still running?")
-            self.ollama_available = False # Potentially set to false if connection fails
-        except requests.exceptions.HTTPError as e:
-             self.log_message(f"Bot: HTTP error from Ollama API - Status {e.response.status_code}: {e.response.text}")
-        except requests.exceptions.RequestException as e:
-            self.log_message(f"Bot: Error sending request to Ollama: {e}")
-        except json.JSONDecodeError: # Should be caught by line-by-line decoding, but as a fallback
-            self.log_message("Bot: Error decoding the final Ollama response.")
-        except Exception as e:
-            self.log_message(f"Bot: Error processing Ollama response: {e}")
+    def _on_ollama_connection_lost(self):
+        self.ollama_available = False # Re-probe before the next message
+        self._ollama_checked_at = None
+
+    def _on_ollama_done(self):
+        self.chat_display.moveCursor(QTextCursor.End)
+        self.user_input.setEnabled(True)
+        self.user_input.setFocus()
 
     def check_for_updates(self, from_tray=False):
         source_msg = "from tray" if from_tray else "from UI button"
         self.log_message(f"Checking for updates ({source_msg})...")
 
-        if git is None:
+        if _lazy_git() is None:
             self.log_message("Error: GitPython library is not installed. Update functionality disabled.")
             QMessageBox.critical(self, "Update Error", "GitPython library is not installed. Please install it to use the update feature.")
             return
 
-        repo_url = "https://github.com/onlyzerosonce/SigmaOne"
-
-        path_to_check_git = self.local_repo_path # Default path, e.g., "./app_repo"
-        # If self.local_repo_path does not exist or doesn't contain .git, try current directory "."
-        if not os.path.exists(os.path.join(path_to_check_git, ".git")):
-            self.log_message(f"'.git' not found in '{os.path.abspath(path_to_check_git)}'. Trying current directory '.'")
-            path_to_check_git = "."
-
-        try:
-            if not os.path.exists(os.path.join(path_to_check_git, ".git")):
-                self.log_message(f"Cannot check for updates: '.git' folder not found in '{os.path.abspath(self.local_repo_path)}' or in current directory '{os.path.abspath('.')}'.")
-                QMessageBox.information(self, "Update Check", f"Cannot check for updates (not a Git repository).\nPlease visit {repo_url} for the latest version.")
-                return
-
-            self.log_message(f"Using Git repository at '{os.path.abspath(path_to_check_git)}'")
-            repo = git.Repo(path_to_check_git)
-
-            # Handle detached HEAD state (e.g., after a direct checkout of a commit)
-            if repo.head.is_detached:
-                self.log_message("Warning: Git HEAD is detached. Cannot reliably check for updates against a branch.")
-                QMessageBox.warning(self, "Update Check", "Your local repository is in a 'detached HEAD' state. Cannot automatically check for updates. Please manually check the repository for new versions.")
-                return
-
-            self.log_message("Fetching latest changes from remote (origin)...")
-            origin = repo.remotes.origin
-            origin.fetch()
-
-            local_commit = repo.head.commit
-
-            # Determine remote reference (main or master)
-            remote_ref_name = None
-            if 'main' in repo.remotes.origin.refs:
-                remote_ref_name = 'main'
-            elif 'master' in repo.remotes.origin.refs:
-                remote_ref_name = 'master'
-            else:
-                self.log_message("Error: Could not find 'main' or 'master' branch on remote 'origin'.")
-                QMessageBox.critical(self, "Update Error", "Could not determine the default branch (main/master) on the remote repository.")
+        # Repeat clicks within a minute reuse the previous outcome instead of
+        # spawning git subprocesses and network round trips again.
+        if self._last_update_check is not None:
+            ts, title, message = self._last_update_check
+            if time.monotonic() - ts < 60:
+                self.log_message("Update check completed less than a minute ago; reusing the previous result.")
+                QMessageBox.information(self, title, message)
                 return
 
-            remote_commit = repo.remotes.origin.refs[remote_ref_name].commit
-
-            self.log_message(f"Local commit: {local_commit.hexsha} ({repo.active_branch.name})")
-            self.log_message(f"Remote commit: {remote_commit.hexsha} (origin/{remote_ref_name})")
-
-            if local_commit != remote_commit:
-                self.log_message("Update available.")
-                QMessageBox.information(self, "Update Available",
-                                        f"A new version is available on branch '{remote_ref_name}' at {repo_url}\n"
-                                        "Please consider updating your local repository or downloading the latest version.")
-            else:
-                self.log_message("Application is up to date.")
-                QMessageBox.information(self, "No Updates", f"Your application (branch '{repo.active_branch.name}') is currently up to date with 'origin/{remote_ref_name}'.")
+        repo_url = "https://github.com/onlyzerosonce/SigmaOne"
 
-        except git.InvalidGitRepositoryError:
-            self.log_message(f"Error: The path '{os.path.abspath(path_to_check_git)}' is not a valid Git repository.")
-            QMessageBox.warning(self, "Update Error", f"The application could not find a valid Git repository at the expected location: {os.path.abspath(path_to_check_git)}")
-        except git.NoSuchPathError:
-             self.log_message(f"Error: The path '{os.path.abspath(path_to_check_git)}' does not exist for Git operations.")
-             QMessageBox.warning(self, "Update Error", f"The application path for Git operations does not exist: {os.path.abspath(path_to_check_git)}")
-        except git.GitCommandError as e:
-            self.log_message(f"A Git command failed: {e}")
-            QMessageBox.critical(self, "Update Error", f"An error occurred during Git operation: {e}")
-        except Exception as e:
-            self.log_message(f"An unexpected error occurred during update check: {e}")
-            QMessageBox.critical(self, "Update Error", f"An unexpected error occurred: {e}")
+        # Run the compare off the GUI thread; results come back via signals.
+        self.update_button.setEnabled(False)
+
+        task = GitUpdateTask(self.local_repo_path, repo_url, self._repo_cache)
+        task.signals.log.connect(self.log_message)
+        task.signals.info.connect(self._show_update_info)
+        task.signals.warning.connect(self._show_update_warning)
+        task.signals.critical.connect(self._show_update_critical)
+        task.signals.done.connect(self._on_update_check_done)
+        QThreadPool.globalInstance().start(task)
+
+    def _show_update_info(self, title, message):
+        # Only successful outcomes are cached; errors always retry.
+        self._last_update_check = (time.monotonic(), title, message)
+        QMessageBox.information(self, title, message)
+
+    def _show_update_warning(self, title, message):
+        QMessageBox.warning(self, title, message)
+
+    def _show_update_critical(self, title, message):
+        QMessageBox.critical(self, title, message)
+
+    def _on_update_check_done(self):
+        self.update_button.setEnabled(True)
+
+    def closeEvent(self, event):
+        # Wind down the worker thread and release the pooled Ollama connection.
+        self.io_thread.quit()
+        self.io_thread.wait(2000)
+        if self.session is not None:
+            self.session.close()
+        super().closeEvent(event)
 
 
 if __name__ == '__main__':